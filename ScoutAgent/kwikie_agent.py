@@ -112,11 +112,26 @@ _mcp_client = None
 _agent_init_lock = asyncio.Lock()
 
 
+# Resolve AWS credentials once per process; boto3.Session construction is
+# heavyweight and the Gateway transport may be rebuilt on reconnects.
+_boto_session = None
+_boto_credentials = None
+
+
+def _get_credentials():
+    """Return cached botocore credentials, resolving them on first use."""
+    global _boto_session, _boto_credentials
+
+    if _boto_credentials is None:
+        _boto_session = boto3.Session()
+        _boto_credentials = _boto_session.get_credentials()
+
+    return _boto_credentials
+
+
 def get_sigv4_auth() -> SigV4Auth:
     """Get AWS SigV4 auth for httpx requests."""
-    session = boto3.Session()
-    credentials = session.get_credentials()
-    frozen_credentials = credentials.get_frozen_credentials()
+    frozen_credentials = _get_credentials().get_frozen_credentials()
 
     return SigV4Auth(
         access_key=frozen_credentials.access_key,
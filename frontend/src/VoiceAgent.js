@@ -14,7 +14,7 @@ import {
 } from '@cloudscape-design/components';
 import BidiEvent from './helper/bidiEvents';
 import EventDisplay from './components/EventDisplay';
-import { base64ToFloat32Array } from './helper/audioHelper';
+import { base64ToFloat32Array, pcmBufferToFloat32Array } from './helper/audioHelper';
 import AudioPlayer from './helper/audioPlayer';
 
 class VoiceAgent extends React.Component {
@@ -47,6 +47,7 @@ class VoiceAgent extends React.Component {
         this.audioBufferSize = 0;
         
         this.socket = null;
+        this.wsTextDecoder = new TextDecoder();
         this.mediaRecorder = null;
         this.chatMessagesEndRef = React.createRef();
         this.chatAreaRef = React.createRef();
@@ -136,12 +137,40 @@ class VoiceAgent extends React.Component {
         this.setState({ isPlaying: false });
     }
 
+    handleBinaryAudio(buffer) {
+        // Tagged binary frame: 0x01 followed by raw 16-bit PCM
+        try {
+            const pcmBytes = buffer.byteLength - 1;
+            if (pcmBytes > this.MAX_AUDIO_CHUNK_SIZE) {
+                console.warn(`Audio chunk size (${pcmBytes}) exceeds maximum allowed (${this.MAX_AUDIO_CHUNK_SIZE}). Skipping chunk.`);
+                return;
+            }
+
+            this.audioBufferSize += pcmBytes;
+            this.audioChunkCount++;
+
+            this.audioPlayer.playAudio(pcmBufferToFloat32Array(buffer, 1));
+
+            if (this.audioChunkCount % 100 === 0) {
+                const bufferMB = (this.audioBufferSize / (1024 * 1024)).toFixed(2);
+                console.log(`[Audio Progress] Chunk #${this.audioChunkCount}, Buffer: ${bufferMB}MB`);
+            }
+        } catch (error) {
+            console.error("Error processing audio chunk:", error);
+        }
+    }
+
     handleIncomingMessage(message) {
         // BidiAgent uses flat event structure with "type" field
         const eventType = message?.type;
         var chatMessages = this.state.chatMessages;
 
         switch(eventType) {
+            case "batch":
+                // Server coalesces bursts of events into a single frame
+                (message.events || []).forEach((e) => this.handleIncomingMessage(e));
+                break;
+
             case "bidi_response_start":
                 // New response starting - update the current response ID only if it changed
                 const newResponseId = message.response_id || `response-${Date.now()}`;
@@ -392,7 +421,9 @@ class VoiceAgent extends React.Component {
                 console.log(`Connecting to ${data.environment} WebSocket...`);
 
                 this.socket = new WebSocket(wsUrl);
-                
+                // Server may send JSON in binary frames; decode before parsing
+                this.socket.binaryType = "arraybuffer";
+
                 this.socket.onopen = () => {
                     console.log("WebSocket connected to BidiAgent!");
                     this.setState({status: "connected"});
@@ -400,10 +431,18 @@ class VoiceAgent extends React.Component {
                     // No need to send sessionStart, promptStart, etc.
                 };
 
-                // Handle incoming messages
+                // Handle incoming messages: tagged binary audio frames
+                // (first byte 0x01), binary JSON frames, or text frames
                 this.socket.onmessage = (message) => {
-                    const event = JSON.parse(message.data);
-                    this.handleIncomingMessage(event);
+                    if (message.data instanceof ArrayBuffer) {
+                        if (message.data.byteLength > 0 && new Uint8Array(message.data, 0, 1)[0] === 0x01) {
+                            this.handleBinaryAudio(message.data);
+                            return;
+                        }
+                        this.handleIncomingMessage(JSON.parse(this.wsTextDecoder.decode(message.data)));
+                        return;
+                    }
+                    this.handleIncomingMessage(JSON.parse(message.data));
                 };
 
                 // Handle errors
@@ -14,4 +14,15 @@ function base64ToFloat32Array(base64String) {
     return float32Array;
 }
 
-export { base64ToFloat32Array };
+function pcmBufferToFloat32Array(buffer, byteOffset = 0) {
+    // slice() copies, which also realigns odd offsets for the Int16 view
+    const int16Array = new Int16Array(buffer.slice(byteOffset));
+    const float32Array = new Float32Array(int16Array.length);
+    for (let i = 0; i < int16Array.length; i++) {
+        float32Array[i] = int16Array[i] / 32768.0;
+    }
+
+    return float32Array;
+}
+
+export { base64ToFloat32Array, pcmBufferToFloat32Array };
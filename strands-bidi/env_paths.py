@@ -0,0 +1,8 @@
+"""
+Environment file path resolution for the voice agent servers.
+Computed once at import so every entry point shares a single resolve + stat.
+"""
+from pathlib import Path
+
+ENV_PATH = (Path(__file__).parent / ".env").resolve()
+ENV_EXISTS = ENV_PATH.exists()
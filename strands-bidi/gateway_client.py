@@ -3,6 +3,8 @@ Gateway Client - MCP client setup for AgentCore Gateway.
 Handles AWS SigV4 authentication for secure Gateway access.
 
 """
+import os
+
 import boto3
 from mcp.client.streamable_http import streamablehttp_client
 from httpx_auth_awssigv4 import SigV4Auth
@@ -10,13 +12,32 @@ from strands.tools.mcp import MCPClient
 
 from scout_config import GATEWAY_URL, REGION, SERVICE
 
+# boto3.Session construction is heavyweight (plugin imports, config parsing),
+# far too costly to repeat per MCP transport. Resolve credentials once and
+# reuse them; the cache is invalidated if the environment credentials rotate
+# underneath us (the IMDS refresh task rewrites them in place).
+_session = None
+_credentials = None
+
+
+def _get_credentials():
+    """Return the cached botocore credentials, re-resolving on rotation."""
+    global _session, _credentials
+
+    env_key = os.environ.get("AWS_ACCESS_KEY_ID")
+    if _credentials is None or (
+        env_key and _credentials.get_frozen_credentials().access_key != env_key
+    ):
+        _session = boto3.Session()
+        _credentials = _session.get_credentials()
+
+    return _credentials
+
 
 def get_sigv4_auth() -> SigV4Auth:
     """Get AWS SigV4 auth for httpx requests."""
-    session = boto3.Session()
-    credentials = session.get_credentials()
-    frozen_credentials = credentials.get_frozen_credentials()
-    
+    frozen_credentials = _get_credentials().get_frozen_credentials()
+
     return SigV4Auth(
         access_key=frozen_credentials.access_key,
         secret_key=frozen_credentials.secret_key,
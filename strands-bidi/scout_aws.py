@@ -0,0 +1,97 @@
+"""
+EC2 IMDS credential helpers for production deployment.
+Kept separate from the server module so AWS plumbing lives in one place.
+"""
+import httpx
+
+# Shared async client for IMDS: keeps the link-local connection alive across
+# the token/role/credentials calls and keeps metadata I/O off the event loop's
+# blocking path. Short timeout so a missing IMDS doesn't stall startup.
+_imds_client = None
+
+
+def _get_imds_client() -> httpx.AsyncClient:
+    global _imds_client
+    if _imds_client is None:
+        _imds_client = httpx.AsyncClient(
+            base_url="http://169.254.169.254",
+            timeout=httpx.Timeout(1.0),
+        )
+    return _imds_client
+
+
+async def aclose_imds_client():
+    """Close the shared IMDS client (call on server shutdown)."""
+    global _imds_client
+    if _imds_client is not None:
+        await _imds_client.aclose()
+        _imds_client = None
+
+
+async def get_imdsv2_token():
+    """Get IMDSv2 token for secure metadata access."""
+    try:
+        response = await _get_imds_client().put(
+            "/latest/api/token",
+            headers={"X-aws-ec2-metadata-token-ttl-seconds": "21600"},
+        )
+        if response.status_code == 200:
+            return response.text
+    except Exception:
+        pass
+    return None
+
+
+async def get_credentials_from_imds():
+    """Retrieve IAM role credentials from EC2 IMDS (tries IMDSv2 first, falls back to IMDSv1)."""
+    result = {
+        "success": False,
+        "credentials": None,
+        "role_name": None,
+        "method_used": None,
+        "error": None,
+    }
+
+    try:
+        token = await get_imdsv2_token()
+        headers = {"X-aws-ec2-metadata-token": token} if token else {}
+        result["method_used"] = "IMDSv2" if token else "IMDSv1"
+
+        role_response = await _get_imds_client().get(
+            "/latest/meta-data/iam/security-credentials/",
+            headers=headers,
+        )
+
+        if role_response.status_code != 200:
+            result["error"] = (
+                f"Failed to retrieve IAM role: HTTP {role_response.status_code}"
+            )
+            return result
+
+        role_name = role_response.text.strip()
+        result["role_name"] = role_name
+
+        creds_response = await _get_imds_client().get(
+            f"/latest/meta-data/iam/security-credentials/{role_name}",
+            headers=headers,
+        )
+
+        if creds_response.status_code != 200:
+            result["error"] = (
+                f"Failed to retrieve credentials: HTTP {creds_response.status_code}"
+            )
+            return result
+
+        credentials = creds_response.json()
+        result["success"] = True
+        result["credentials"] = {
+            "AccessKeyId": credentials.get("AccessKeyId"),
+            "SecretAccessKey": credentials.get("SecretAccessKey"),
+            "Token": credentials.get("Token"),
+            "Expiration": credentials.get("Expiration"),
+        }
+
+    except Exception as e:
+        result["error"] = str(e)
+
+    return result
@@ -2,6 +2,7 @@
 Scout Voice Agent Configuration.
 Contains system prompt, constants, and agent settings.
 """
+from types import MappingProxyType
 
 # Agent Identity
 AGENT_NAME = "Scout"
@@ -65,15 +66,16 @@ Gets detailed loan information from Hydra API.
 """
 
 # Inference Configuration for Nova Sonic
-INFERENCE_CONFIG = {
+# Read-only views: callers can pass these around without defensive copies.
+INFERENCE_CONFIG = MappingProxyType({
     "maxTokens": 1024,
     "topP": 0.9,
     "temperature": 0.7,
-}
+})
 
 # Audio Configuration
-AUDIO_CONFIG = {
+AUDIO_CONFIG = MappingProxyType({
     "voice": VOICE_ID,
     "sampleRate": 24000,  # Output sample rate
-}
+})
 
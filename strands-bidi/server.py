@@ -14,19 +14,25 @@ Features:
 For local testing, use test_agent.py instead.
 """
 import logging
+import queue
 import uvicorn
 import os
+import time
 import asyncio
-import requests
-from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+import orjson
 from contextlib import asynccontextmanager
+from functools import partial
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from dotenv import load_dotenv
+
 from strands.experimental.bidi.agent import BidiAgent
 from strands.experimental.bidi.models.nova_sonic import BidiNovaSonicModel
 
+from env_paths import ENV_PATH, ENV_EXISTS
 from scout_config import (
     AGENT_NAME,
     NOVA_MODEL_ID,
@@ -35,150 +41,147 @@ from scout_config import (
     SYSTEM_PROMPT,
 )
 from gateway_client import create_mcp_client, load_gateway_tools
+from scout_aws import get_credentials_from_imds, aclose_imds_client
 from websocket_helpers import create_presigned_url
 
 logging.basicConfig(level=logging.INFO)
+
+# Route records through a queue so log calls on the event loop just enqueue;
+# a background listener thread does the actual stderr I/O.
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(
+    _log_queue, *logging.getLogger().handlers, respect_handler_level=True
+)
+logging.getLogger().handlers = [QueueHandler(_log_queue)]
+_log_listener.start()
+
 logger = logging.getLogger(__name__)
 
-_credential_refresh_task = None
+# Load local credentials from .env when present (no-op in the container).
+# Skipped entirely when the environment already carries credentials, so the
+# common deployed path never reads the file.
+if ENV_EXISTS and not (
+    os.getenv("AWS_ACCESS_KEY_ID") and os.getenv("AWS_SECRET_ACCESS_KEY")
+):
+    load_dotenv(ENV_PATH)
+
+_credential_refresh_handle = None
 _mcp_client = None
-_tools = None
+_tools_future = None
 
 
-def get_imdsv2_token():
-    """Get IMDSv2 token for secure metadata access."""
-    try:
-        response = requests.put(
-            "http://169.254.169.254/latest/api/token",
-            headers={"X-aws-ec2-metadata-token-ttl-seconds": "21600"},
-            timeout=2,
-        )
-        if response.status_code == 200:
-            return response.text
-    except Exception:
-        pass
-    return None
-
-
-def get_credentials_from_imds():
-    """Retrieve IAM role credentials from EC2 IMDS (tries IMDSv2 first, falls back to IMDSv1)."""
-    result = {
-        "success": False,
-        "credentials": None,
-        "role_name": None,
-        "method_used": None,
-        "error": None,
-    }
+# IMDS rotates role credentials on a ~6h cadence; refreshing hourly keeps a
+# comfortable margin without parsing the Expiration timestamp every cycle.
+_REFRESH_INTERVAL = 3600.0
+_REFRESH_RETRY_INTERVAL = 300.0
 
-    try:
-        token = get_imdsv2_token()
-        headers = {"X-aws-ec2-metadata-token": token} if token else {}
-        result["method_used"] = "IMDSv2" if token else "IMDSv1"
-
-        role_response = requests.get(
-            "http://169.254.169.254/latest/meta-data/iam/security-credentials/",
-            headers=headers,
-            timeout=2,
-        )
 
-        if role_response.status_code != 200:
-            result["error"] = (
-                f"Failed to retrieve IAM role: HTTP {role_response.status_code}"
-            )
-            return result
+def _schedule_credential_refresh(delay: float):
+    """Arm a timer for the next refresh instead of keeping a task alive."""
+    global _credential_refresh_handle
+    loop = asyncio.get_running_loop()
+    _credential_refresh_handle = loop.call_at(
+        loop.time() + delay,
+        lambda: asyncio.ensure_future(_refresh_credentials_once()),
+    )
+    logger.info(f"   Next credential refresh in {delay:.0f}s")
 
-        role_name = role_response.text.strip()
-        result["role_name"] = role_name
 
-        creds_response = requests.get(
-            f"http://169.254.169.254/latest/meta-data/iam/security-credentials/{role_name}",
-            headers=headers,
-            timeout=2,
-        )
+async def _refresh_credentials_once():
+    """Fetch fresh IMDS credentials, then re-arm the refresh timer."""
+    try:
+        imds_result = await get_credentials_from_imds()
 
-        if creds_response.status_code != 200:
-            result["error"] = (
-                f"Failed to retrieve credentials: HTTP {creds_response.status_code}"
-            )
-            return result
+        if imds_result["success"]:
+            creds = imds_result["credentials"]
 
-        credentials = creds_response.json()
-        result["success"] = True
-        result["credentials"] = {
-            "AccessKeyId": credentials.get("AccessKeyId"),
-            "SecretAccessKey": credentials.get("SecretAccessKey"),
-            "Token": credentials.get("Token"),
-            "Expiration": credentials.get("Expiration"),
-        }
+            os.environ["AWS_ACCESS_KEY_ID"] = creds["AccessKeyId"]
+            os.environ["AWS_SECRET_ACCESS_KEY"] = creds["SecretAccessKey"]
+            os.environ["AWS_SESSION_TOKEN"] = creds["Token"]
 
+            logger.info(f"✅ Credentials refreshed ({imds_result['method_used']})")
+            delay = _REFRESH_INTERVAL
+        else:
+            logger.error(f"Failed to refresh credentials: {imds_result['error']}")
+            delay = _REFRESH_RETRY_INTERVAL
     except Exception as e:
-        result["error"] = str(e)
+        logger.error(f"Error in credential refresh: {e}")
+        delay = _REFRESH_RETRY_INTERVAL
 
-    return result
+    _schedule_credential_refresh(delay)
 
 
-async def refresh_credentials_from_imds():
-    """Background task to refresh credentials from IMDS."""
-    logger.info("Starting credential refresh task")
+# Audio settings shared by every voice; only "voice" varies per model.
+_AUDIO_CFG_TEMPLATE = {
+    "input_sample_rate": 16000,
+    "output_sample_rate": 16000,  # Nova Sonic outputs at 16kHz
+}
 
-    while True:
-        try:
-            imds_result = get_credentials_from_imds()
+# Nova Sonic model construction pulls in bedrock-runtime client setup, so
+# reuse one model per voice instead of rebuilding on every connection.
+_MODEL_CACHE = {}
+_MODEL_CACHE_MAX = 8
+_model_cache_lock = asyncio.Lock()
 
-            if imds_result["success"]:
-                creds = imds_result["credentials"]
 
-                os.environ["AWS_ACCESS_KEY_ID"] = creds["AccessKeyId"]
-                os.environ["AWS_SECRET_ACCESS_KEY"] = creds["SecretAccessKey"]
-                os.environ["AWS_SESSION_TOKEN"] = creds["Token"]
+async def get_or_create_model(voice_id: str) -> BidiNovaSonicModel:
+    """Get or create the Nova Sonic model for a voice (bounded, oldest-out)."""
+    model = _MODEL_CACHE.get(voice_id)
+    if model is not None:
+        return model
 
-                logger.info(f"✅ Credentials refreshed ({imds_result['method_used']})")
+    async with _model_cache_lock:
+        model = _MODEL_CACHE.get(voice_id)
+        if model is None:
+            model = BidiNovaSonicModel(
+                region=REGION,
+                model_id=NOVA_MODEL_ID,
+                provider_config={
+                    "audio": {**_AUDIO_CFG_TEMPLATE, "voice": voice_id}
+                },
+            )
+            if len(_MODEL_CACHE) >= _MODEL_CACHE_MAX:
+                _MODEL_CACHE.pop(next(iter(_MODEL_CACHE)))
+            _MODEL_CACHE[voice_id] = model
 
-                try:
-                    expiration = datetime.fromisoformat(
-                        creds["Expiration"].replace("Z", "+00:00")
-                    )
-                    now = datetime.now(expiration.tzinfo)
-                    time_until_expiration = (expiration - now).total_seconds()
-                    refresh_interval = min(max(time_until_expiration - 300, 60), 3600)
-                    logger.info(f"   Next refresh in {refresh_interval:.0f}s")
-                except Exception:
-                    refresh_interval = 3600
+    return model
 
-                await asyncio.sleep(refresh_interval)
-            else:
-                logger.error(f"Failed to refresh credentials: {imds_result['error']}")
-                await asyncio.sleep(300)
 
-        except asyncio.CancelledError:
-            logger.info("Credential refresh task cancelled")
-            break
-        except Exception as e:
-            logger.error(f"Error in credential refresh: {e}")
-            await asyncio.sleep(300)
+async def get_tools():
+    """Get or initialize Gateway tools (initialized exactly once).
 
+    Concurrent cold-start callers all await the same future, so a burst of
+    connections cannot race the None check and spawn duplicate MCP clients.
+    """
+    global _mcp_client, _tools_future
+
+    if _tools_future is None:
+        future = asyncio.get_running_loop().create_future()
+        _tools_future = future
 
-async def get_tools():
-    """Get or initialize Gateway tools (singleton pattern)."""
-    global _mcp_client, _tools
-    
-    if _tools is None:
         logger.info("Loading Gateway tools...")
-        _mcp_client = create_mcp_client()
-        _tools = await load_gateway_tools(_mcp_client)
-        logger.info(f"Loaded {len(_tools)} tools from Gateway")
-        for tool in _tools:
+        try:
+            _mcp_client = create_mcp_client()
+            tools = await load_gateway_tools(_mcp_client)
+        except BaseException as e:
+            _tools_future = None  # let the next caller retry
+            future.set_exception(e)
+            future.exception()  # mark retrieved for waiters-free failures
+            raise
+
+        logger.info(f"Loaded {len(tools)} tools from Gateway")
+        for tool in tools:
             spec = getattr(tool, 'tool_spec', {})
             logger.info(f"  Tool: {spec.get('name', 'unknown')}")
-    
-    return _tools
+        future.set_result(tools)
+        return tools
+
+    return await _tools_future
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
-    global _credential_refresh_task
-
     # Startup
     logger.info("=" * 70)
     logger.info(f"{AGENT_NAME} Voice Agent - Starting...")
@@ -193,7 +196,7 @@ async def lifespan(app: FastAPI):
         logger.info("Using credentials from environment (local mode)")
     else:
         logger.info("Fetching credentials from EC2 IMDS...")
-        imds_result = get_credentials_from_imds()
+        imds_result = await get_credentials_from_imds()
 
         if imds_result["success"]:
             creds = imds_result["credentials"]
@@ -203,10 +206,7 @@ async def lifespan(app: FastAPI):
 
             logger.info(f"Credentials loaded ({imds_result['method_used']})")
 
-            _credential_refresh_task = asyncio.create_task(
-                refresh_credentials_from_imds()
-            )
-            logger.info("Credential refresh task started")
+            _schedule_credential_refresh(_REFRESH_INTERVAL)
         else:
             logger.error(f"Failed to fetch credentials: {imds_result['error']}")
     
@@ -225,12 +225,12 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down...")
 
-    if _credential_refresh_task and not _credential_refresh_task.done():
-        _credential_refresh_task.cancel()
-        try:
-            await _credential_refresh_task
-        except asyncio.CancelledError:
-            pass
+    if _credential_refresh_handle is not None:
+        _credential_refresh_handle.cancel()
+
+    await aclose_imds_client()
+
+    _log_listener.stop()
 
 
 app = FastAPI(
@@ -264,6 +264,13 @@ async def health_check():
     })
 
 
+# Pre-signed URLs stay valid for an hour; reuse one per voice until it is
+# within 5 minutes of expiry so UI reconnects/polls don't re-sign.
+_PRESIGN_EXPIRES = 3600
+_PRESIGN_MARGIN = 300
+_presigned_url_cache = {}  # voice_id -> (expires_at_monotonic, signed_url)
+
+
 @app.get("/get-websocket-url")
 async def get_websocket_url(voice_id: str = "matthew"):
     """
@@ -276,26 +283,40 @@ async def get_websocket_url(voice_id: str = "matthew"):
         is_production = os.getenv("DOCKER_CONTAINER") == "1"
         
         if is_production:
-            # Production: Return pre-signed AgentCore URL
-            base_url = f"wss://runtime.bedrock-agentcore.{REGION}.amazonaws.com/agents/{agentcore_runtime_id}/ws"
-            
-            # Add voice_id to the base URL
-            if "?" in base_url:
-                base_url += f"&voice_id={voice_id}"
+            # Production: Return pre-signed AgentCore URL, reusing a cached
+            # signature while it has comfortable lifetime left
+            now = time.monotonic()
+            cached = _presigned_url_cache.get(voice_id)
+
+            if cached is not None and cached[0] > now + _PRESIGN_MARGIN:
+                signed_url = cached[1]
             else:
-                base_url += f"?voice_id={voice_id}"
-            
-            # Generate pre-signed URL
-            signed_url = create_presigned_url(
-                base_url=base_url,
-                region=REGION,
-                service="bedrock-agentcore",
-                expires=3600  # 1 hour
-            )
-            
+                base_url = f"wss://runtime.bedrock-agentcore.{REGION}.amazonaws.com/agents/{agentcore_runtime_id}/ws"
+
+                # Add voice_id to the base URL
+                if "?" in base_url:
+                    base_url += f"&voice_id={voice_id}"
+                else:
+                    base_url += f"?voice_id={voice_id}"
+
+                # Generate pre-signed URL
+                signed_url = create_presigned_url(
+                    base_url=base_url,
+                    region=REGION,
+                    service="bedrock-agentcore",
+                    expires=_PRESIGN_EXPIRES
+                )
+                _presigned_url_cache[voice_id] = (
+                    now + _PRESIGN_EXPIRES,
+                    signed_url,
+                )
+                # Evict anything already expired while we're here
+                for key in [k for k, v in _presigned_url_cache.items() if v[0] <= now]:
+                    _presigned_url_cache.pop(key, None)
+
             return JSONResponse({
                 "websocket_url": signed_url,
-                "expires_in": 3600,
+                "expires_in": _PRESIGN_EXPIRES,
                 "environment": "production"
             })
         else:
@@ -318,6 +339,88 @@ async def get_websocket_url(voice_id: str = "matthew"):
         )
 
 
+# Cap concurrent voice sessions: past a few sessions per core the event loop
+# thrashes between idle agent state machines instead of serving active ones.
+_MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", str((os.cpu_count() or 1) * 4)))
+_session_semaphore = asyncio.Semaphore(_MAX_SESSIONS)
+
+
+# Per-event logging for the WebSocket pass-through. Audio frames are never
+# logged; everything else resolves through a dispatch table so the hot path
+# pays one dict lookup instead of an if/elif chain.
+_SKIP_LOG = frozenset({"bidi_audio_input", "bidi_audio_stream"})
+
+
+# Only two roles ever appear; skip the per-message .upper()
+_ROLE_UC = {"assistant": "ASSISTANT", "user": "USER"}
+
+
+def _log_transcript(data):
+    text = data.get("text", data.get("transcript", ""))
+    role = data.get("role", "assistant")
+    logger.info(f"➡️  {_ROLE_UC.get(role) or role.upper()}: {text}")
+
+
+def _log_tool_use(data):
+    tool_name = data.get("current_tool_use", {}).get("name", "unknown")
+    logger.info(f"🔧 TOOL: {tool_name}")
+
+
+def _log_tool_result(data):
+    tool_name = data.get("tool_result", {}).get("name", "unknown")
+    logger.info(f"✅ TOOL RESULT: {tool_name}")
+
+
+def _log_response_marker(data):
+    logger.info(f"➡️  {data['type']}")
+
+
+_SEND_LOG_HANDLERS = {
+    "bidi_transcript_stream": _log_transcript,
+    "tool_use_stream": _log_tool_use,
+    "tool_result": _log_tool_result,
+    "bidi_response_start": _log_response_marker,
+    "bidi_response_complete": _log_response_marker,
+}
+
+
+# Module-level frame wrappers, bound per connection with functools.partial.
+# Defining these as nested closures allocated fresh function objects per
+# connection and added closure-cell indirection on every frame.
+# Frequently-touched globals are bound as parameter defaults so each frame
+# reads fast locals instead of doing module-dict lookups.
+async def _logged_receive_json(
+    websocket, log_enabled, _loads=orjson.loads, _skip=_SKIP_LOG, _log=logger.info
+):
+    # orjson parses straight from bytes; accept text frames too for older
+    # clients.
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code") or 1000)
+    raw = message.get("bytes")
+    if raw is None:
+        raw = message.get("text", "")
+    data = _loads(raw)
+
+    if log_enabled:
+        event_type = data.get("type", "unknown")
+        if event_type not in _skip:
+            _log(f"⬅️  {event_type}: {str(data)[:150]}")
+
+    return data
+
+
+async def _logged_send_json(
+    websocket, log_enabled, data, _dumps=orjson.dumps, _handlers=_SEND_LOG_HANDLERS
+):
+    if log_enabled:
+        handler = _handlers.get(data.get("type"))
+        if handler is not None:
+            handler(data)
+
+    await websocket.send_bytes(_dumps(data))
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """
@@ -329,81 +432,54 @@ async def websocket_endpoint(websocket: WebSocket):
     """
     await websocket.accept()
 
+    # Shed load before any heavy session setup when at capacity
+    if _session_semaphore.locked():
+        try:
+            await websocket.send_json(
+                {"type": "busy", "message": "Server at capacity, try again shortly"}
+            )
+            await websocket.close(code=1013)  # Try Again Later
+        except Exception:
+            pass
+        return
+
     # Get voice_id from query params
     voice_id = websocket.query_params.get("voice_id", VOICE_ID)
     logger.info(f"New connection from {websocket.client}, voice: {voice_id}")
 
     try:
-        # Load Gateway tools
-        tools = await get_tools()
-        
-        # Create Nova Sonic model
-        model = BidiNovaSonicModel(
-            region=REGION,
-            model_id=NOVA_MODEL_ID,
-            provider_config={
-                "audio": {
-                    "input_sample_rate": 16000,
-                    "output_sample_rate": 16000,  # Nova Sonic outputs at 16kHz
-                    "voice": voice_id,
-                }
-            },
-        )
+        async with _session_semaphore:
+            # Load Gateway tools
+            tools = await get_tools()
+
+            # Get the (cached) Nova Sonic model for this voice
+            model = await get_or_create_model(voice_id)
+
+            # Create BidiAgent with Scout configuration
+            agent = BidiAgent(
+                model=model,
+                tools=tools,
+                system_prompt=SYSTEM_PROMPT,
+            )
 
-        # Create BidiAgent with Scout configuration
-        agent = BidiAgent(
-            model=model,
-            tools=tools,
-            system_prompt=SYSTEM_PROMPT,
-        )
-        
-        logger.info(f"BidiAgent created for {AGENT_NAME}")
-        logger.info(f"Tools: {len(tools)} loaded from Gateway")
-        logger.info("Starting bi-directional streaming...")
-
-        # Wrap WebSocket I/O with selective logging (only important events)
-        async def logged_receive_json():
-            data = await websocket.receive_json()
-            event_type = data.get("type", "unknown")
-            
-            # Only log important events, skip audio chunks
-            if event_type not in ["bidi_audio_input"]:
-                logger.info(f"⬅️  {event_type}: {str(data)[:150]}")
-            
-            return data
-        
-        async def logged_send_json(data):
-            event_type = data.get("type", "unknown")
-            
-            # Only log important events, skip audio chunks
-            if event_type == "bidi_transcript_stream":
-                text = data.get("text", data.get("transcript", ""))
-                role = data.get("role", "assistant").upper()
-                logger.info(f"➡️  {role}: {text}")
-            elif event_type == "tool_use_stream":
-                tool_name = data.get("current_tool_use", {}).get("name", "unknown")
-                logger.info(f"🔧 TOOL: {tool_name}")
-            elif event_type == "tool_result":
-                tool_name = data.get("tool_result", {}).get("name", "unknown")
-                logger.info(f"✅ TOOL RESULT: {tool_name}")
-            elif event_type in ["bidi_response_start", "bidi_response_complete"]:
-                logger.info(f"➡️  {event_type}")
-            # Skip bidi_audio_stream - too noisy
-            
-            await websocket.send_json(data)
-        
-        # Direct WebSocket pass-through to BidiAgent with logging
-        await agent.run(
-            inputs=[logged_receive_json],
-            outputs=[logged_send_json]
-        )
+            # Tool count/agent identity are logged once at startup; keep the
+            # connection-accept path free of constant log formatting
+
+            # Wrap WebSocket I/O with selective logging (only important
+            # events). The log level is resolved once per connection, not
+            # per frame.
+            log_enabled = logger.isEnabledFor(logging.INFO)
+
+            # Direct WebSocket pass-through to BidiAgent with logging
+            await agent.run(
+                inputs=[partial(_logged_receive_json, websocket, log_enabled)],
+                outputs=[partial(_logged_send_json, websocket, log_enabled)]
+            )
 
     except WebSocketDisconnect:
         logger.info("Client disconnected")
     except Exception as e:
-        logger.error(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("WebSocket session failed")
         try:
             await websocket.send_json({"type": "error", "message": str(e)})
         except Exception:
@@ -425,5 +501,13 @@ if __name__ == "__main__":
     logger.info(f"   Deploy with Dockerfile, endpoint will be /ws")
     logger.info("")
 
-    uvicorn.run(app, host=host, port=port)
+    # C-accelerated loop and parsers; all ship with uvicorn[standard]
+    uvicorn.run(
+        app,
+        host=host,
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+    )
 
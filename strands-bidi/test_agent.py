@@ -10,17 +10,24 @@ Simplified server for local development and testing.
 
 For AgentCore deployment, use server.py instead.
 """
+import base64
 import logging
 import uvicorn
 import os
 import asyncio
+import queue
+import threading
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from dotenv import load_dotenv
+
 from strands.experimental.bidi.agent import BidiAgent
 from strands.experimental.bidi.models.nova_sonic import BidiNovaSonicModel
 
+from env_paths import ENV_PATH, ENV_EXISTS
 from scout_config import (
     AGENT_NAME,
     NOVA_MODEL_ID,
@@ -33,27 +40,114 @@ from gateway_client import create_mcp_client, load_gateway_tools
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Load local credentials from .env when present; skipped when the shell
+# already exports credentials so the file is never read twice.
+if ENV_EXISTS and not (
+    os.getenv("AWS_ACCESS_KEY_ID") and os.getenv("AWS_SECRET_ACCESS_KEY")
+):
+    load_dotenv(ENV_PATH)
+
+# Resolved once at import; /get-websocket-url is hit on every frontend
+# reconnect, so keep the env lookups and URL assembly off the request path.
+# The advertised default stays "localhost" (a 0.0.0.0 bind address is not a
+# connectable URL for the browser).
+_HOST = os.getenv("HOST", "localhost")
+_PORT = int(os.getenv("PORT", "8080"))
+_LOCAL_WS_BASE = f"ws://{_HOST}:{_PORT}/ws"
+
 _mcp_client = None
 _tools = None
+_tools_lock = asyncio.Lock()
 
 
 async def get_tools():
-    """Load Gateway tools once and cache them."""
+    """Load Gateway tools once and cache them.
+
+    The lock closes the check-then-set race: concurrent first connections
+    would otherwise each build an MCP client and double-pay the Gateway
+    tool-description fetch.
+    """
     global _mcp_client, _tools
-    
-    if _tools is None:
-        logger.info("Loading Gateway tools...")
-        _mcp_client = await create_mcp_client()
-        _tools = await load_gateway_tools(_mcp_client)
-        logger.info(f"Loaded {len(_tools)} tools from Gateway")
-        for tool in _tools:
-            logger.info(f"  Tool: {tool.name}")
-    
+
+    if _tools is not None:
+        return _tools
+
+    async with _tools_lock:
+        if _tools is None:
+            logger.info("Loading Gateway tools...")
+            _mcp_client = create_mcp_client()
+            _tools = await load_gateway_tools(_mcp_client)
+            logger.info(f"Loaded {len(_tools)} tools from Gateway")
+            for tool in _tools:
+                logger.info(f"  Tool: {tool.name}")
+
     return _tools
 
 
-# Create FastAPI app
-app = FastAPI(title="Scout Voice Agent - Local Test")
+# Nova Sonic model construction sets up a bedrock-runtime client; reuse one
+# model per voice instead of rebuilding on every connect.
+_models = {}
+_models_lock = asyncio.Lock()
+
+
+async def get_model(voice_id: str) -> BidiNovaSonicModel:
+    """Get or create the Nova Sonic model for a voice."""
+    model = _models.get(voice_id)
+    if model is not None:
+        return model
+
+    async with _models_lock:
+        model = _models.get(voice_id)
+        if model is None:
+            model = BidiNovaSonicModel(
+                region=REGION,
+                model_id=NOVA_MODEL_ID,
+                provider_config={
+                    "audio": {
+                        "input_sample_rate": 16000,
+                        "output_sample_rate": 16000,
+                        "voice": voice_id,
+                    }
+                },
+            )
+            _models[voice_id] = model
+
+    return model
+
+
+# Transcript streams log tens of events per second; push tiny tuples to a
+# queue and let a daemon thread pay the LogRecord/formatting cost so the
+# WebSocket send path doesn't.
+_log_q: queue.SimpleQueue = queue.SimpleQueue()
+
+
+def _drain_log_queue():
+    while True:
+        role, text = _log_q.get()
+        if role is None:
+            logger.info("➡️  bidi_response_start")
+        else:
+            logger.info("➡️  %s: %s", role, text)
+
+
+threading.Thread(target=_drain_log_queue, name="send-log", daemon=True).start()
+
+# Dispatch table for outgoing-event logging: one dict lookup on the send
+# path instead of a chain of type compares, and a miss costs nothing.
+_log_handlers = {
+    "bidi_response_start": lambda m: _log_q.put((None, None)),
+    "bidi_transcript_event": lambda m: _log_q.put(
+        (m.get("role", "unknown").upper(), m.get("transcript", ""))
+    ),
+}
+
+
+# Create FastAPI app; orjson serializes the small health/url payloads a few
+# times faster than the stdlib json default
+app = FastAPI(
+    title="Scout Voice Agent - Local Test",
+    default_response_class=ORJSONResponse,
+)
 
 # CORS for local React development
 app.add_middleware(
@@ -74,9 +168,16 @@ async def startup_event():
     logger.info(f"Region: {REGION}")
     logger.info(f"Model: {NOVA_MODEL_ID}")
     logger.info(f"Voice: {VOICE_ID}")
+    logger.info(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
+    # Fail fast if the C-accelerated parsers uvicorn was asked to use are
+    # missing; a silent fallback to h11/wsproto is much slower per frame.
+    import httptools  # noqa: F401
+    import websockets  # noqa: F401
     logger.info("=" * 70)
     logger.info("Pre-loading Gateway tools...")
     await get_tools()
+    logger.info(f"Pre-warming Nova Sonic model (voice: {VOICE_ID})...")
+    await get_model(VOICE_ID)
     logger.info("=" * 70)
     logger.info("Server ready!")
     logger.info("=" * 70)
@@ -85,19 +186,19 @@ async def startup_event():
 @app.get("/ping")
 async def ping():
     """Health check endpoint."""
-    return JSONResponse({"status": "ok", "agent": AGENT_NAME})
+    return {"status": "ok", "agent": AGENT_NAME}
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return JSONResponse({
+    return {
         "status": "healthy",
         "agent": AGENT_NAME,
         "region": REGION,
         "model": NOVA_MODEL_ID,
         "environment": "local"
-    })
+    }
 
 
 @app.get("/get-websocket-url")
@@ -107,15 +208,11 @@ async def get_websocket_url(voice_id: str = "matthew"):
     This endpoint exists for compatibility with the frontend,
     but always returns the local URL.
     """
-    host = os.getenv("HOST", "localhost")
-    port = int(os.getenv("PORT", "8080"))
-    local_url = f"ws://{host}:{port}/ws?voice_id={voice_id}"
-    
-    return JSONResponse({
-        "websocket_url": local_url,
+    return {
+        "websocket_url": f"{_LOCAL_WS_BASE}?voice_id={voice_id}",
         "expires_in": None,
         "environment": "local"
-    })
+    }
 
 
 @app.websocket("/ws")
@@ -126,26 +223,31 @@ async def websocket_endpoint(websocket: WebSocket):
     """
     await websocket.accept()
 
+    # Disable the transport's write high-water mark so drain() only returns
+    # once bytes actually flushed, giving the agent real backpressure instead
+    # of letting bursts pile up in the socket buffer. Backend-dependent, so
+    # probe defensively and fall through if the transport isn't exposed.
+    transport = websocket.scope.get("transport") or getattr(
+        websocket, "_transport", None
+    )
+    if transport is not None and hasattr(transport, "set_write_buffer_limits"):
+        try:
+            transport.set_write_buffer_limits(high=0)
+        except (ValueError, RuntimeError):
+            pass
+
     # Get voice_id from query params
     voice_id = websocket.query_params.get("voice_id", VOICE_ID)
     logger.info(f"New connection from {websocket.client}, voice: {voice_id}")
 
+    writer_task = None
+
     try:
         # Load Gateway tools
         tools = await get_tools()
         
-        # Create Nova Sonic model
-        model = BidiNovaSonicModel(
-            region=REGION,
-            model_id=NOVA_MODEL_ID,
-            provider_config={
-                "audio": {
-                    "input_sample_rate": 16000,
-                    "output_sample_rate": 16000,
-                    "voice": voice_id,
-                }
-            },
-        )
+        # Get the (cached) Nova Sonic model for this voice
+        model = await get_model(voice_id)
 
         # Create BidiAgent with Scout configuration
         agent = BidiAgent(
@@ -160,19 +262,90 @@ async def websocket_endpoint(websocket: WebSocket):
 
         # Log all events for debugging
         async def receive_wrapper():
-            message = await websocket.receive_json()
-            return message
+            # orjson parses straight from bytes; fall back to text frames
+            # for clients that still send them
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code") or 1000)
+            raw = message.get("bytes")
+            if raw is None:
+                raw = message.get("text", "")
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # A malformed frame shouldn't escape into agent.run and
+                # tear the session down; drop it and hand the agent an
+                # event type it ignores.
+                logger.warning("Dropping malformed frame (%d bytes)", len(raw))
+                return {"type": "noop"}
+
+        # Coalesce bursts of small events (transcript deltas, response
+        # markers) into one WebSocket frame so TLS/WS framing overhead is
+        # amortized across the batch.
+        out_q: asyncio.Queue = asyncio.Queue(maxsize=1024)
+
+        async def writer():
+            # Queue items are either event dicts (JSON) or raw tagged audio
+            # frames (bytes). Binary frames are never batched, and a JSON
+            # batch is flushed before one so ordering is preserved.
+            pending = None
+            while True:
+                if pending is not None:
+                    message, pending = pending, None
+                else:
+                    message = await out_q.get()
+                if isinstance(message, (bytes, bytearray)):
+                    await websocket.send_bytes(message)
+                    await asyncio.sleep(0)
+                    continue
+                batch = [message]
+                while len(batch) < 64:
+                    try:
+                        item = out_q.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if isinstance(item, (bytes, bytearray)):
+                        pending = item
+                        break
+                    batch.append(item)
+                if len(batch) == 1:
+                    await websocket.send_bytes(orjson.dumps(message))
+                else:
+                    await websocket.send_bytes(
+                        orjson.dumps({"type": "batch", "events": batch})
+                    )
+                # Yield one tick so producers running in the same loop
+                # iteration can deposit before the next drain — cork-style
+                # coalescing that turns back-to-back events into one frame.
+                await asyncio.sleep(0)
+
+        writer_task = asyncio.create_task(writer())
 
         async def send_wrapper(message):
-            # Log outgoing events
-            if message.get("type") == "bidi_response_start":
-                logger.info("➡️  bidi_response_start")
-            elif message.get("type") == "bidi_transcript_event":
-                role = message.get("role", "unknown")
-                text = message.get("transcript", "")
-                logger.info(f"➡️  {role.upper()}: {text}")
-            
-            await websocket.send_json(message)
+            msg_type = message.get("type")
+
+            # Audio is the dominant byte mover in the stream; ship it as a
+            # tagged binary frame (0x01 + raw PCM) instead of re-wrapping
+            # the base64 payload in JSON on every chunk.
+            if msg_type == "bidi_audio_stream":
+                audio_b64 = message.get("audio")
+                if isinstance(audio_b64, str):
+                    frame = b"\x01" + base64.b64decode(audio_b64)
+                    try:
+                        out_q.put_nowait(frame)
+                    except asyncio.QueueFull:
+                        await out_q.put(frame)
+                    return
+
+            # Log outgoing events (formatted off-thread)
+            handler = _log_handlers.get(msg_type)
+            if handler is not None:
+                handler(message)
+
+            try:
+                out_q.put_nowait(message)
+            except asyncio.QueueFull:
+                await out_q.put(message)  # back-pressure the agent
 
         # Run the agent with WebSocket handlers
         await agent.run(
@@ -183,20 +356,24 @@ async def websocket_endpoint(websocket: WebSocket):
     except WebSocketDisconnect:
         logger.info("Client disconnected")
     except Exception as e:
-        logger.error(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("WebSocket session failed")
         try:
             await websocket.send_json({"type": "error", "message": str(e)})
         except Exception:
             pass
     finally:
+        if writer_task is not None:
+            writer_task.cancel()
         logger.info("Connection closed")
 
 
 if __name__ == "__main__":
     host = os.getenv("HOST", "0.0.0.0")
-    port = int(os.getenv("PORT", "8080"))
+    port = _PORT
+    # One event loop saturates on a single core under many clients; WORKERS>1
+    # spreads connections across processes. Tool/model caches are per-process
+    # (rebuilt in each worker), so sessions must stay sticky to one worker.
+    workers = int(os.getenv("WORKERS", "1"))
 
     logger.info("")
     logger.info("=" * 70)
@@ -208,5 +385,18 @@ if __name__ == "__main__":
     logger.info("=" * 70)
     logger.info("")
 
-    uvicorn.run(app, host=host, port=port)
+    # C-accelerated loop and parsers; all ship with uvicorn[standard].
+    # Multi-worker mode requires the string import form.
+    uvicorn.run(
+        "test_agent:app" if workers > 1 else app,
+        host=host,
+        port=port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        ws_max_size=2 * 1024 * 1024,
+        ws_ping_interval=20,
+        ws_ping_timeout=20,
+    )
 
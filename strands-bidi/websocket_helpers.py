@@ -2,11 +2,79 @@
 WebSocket URL signing helpers for AWS SigV4 authentication.
 Creates pre-signed URLs for connecting to AgentCore Runtime WebSocket endpoints.
 """
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+
 import boto3
 from botocore.auth import SigV4Auth
 from botocore.awsrequest import AWSRequest
-from urllib.parse import urlparse, parse_qs, urlencode
-from datetime import datetime, timedelta
+from urllib.parse import urlparse, parse_qs, parse_qsl, urlencode
+from datetime import datetime, timedelta, timezone
+
+# Session construction walks the full credential provider chain (env vars,
+# shared config parsing, possibly IMDS) on every call. Cache the resolved
+# credentials with a short TTL so reconnect storms don't re-pay that cost but
+# rotated credentials are still picked up. Thread lock because presigning can
+# be called from sync contexts.
+_CREDS_TTL = 300.0
+_creds_lock = threading.Lock()
+_session = None
+_credentials = None
+_creds_fetched_at = 0.0
+
+
+def _get_credentials(region: str):
+    """Return cached botocore credentials, re-resolving after the TTL."""
+    global _session, _credentials, _creds_fetched_at
+
+    now = time.monotonic()
+    if _credentials is not None and now - _creds_fetched_at < _CREDS_TTL:
+        return _credentials
+
+    with _creds_lock:
+        if _credentials is None or now - _creds_fetched_at >= _CREDS_TTL:
+            _session = boto3.Session(region_name=region)
+            _credentials = _session.get_credentials()
+            _creds_fetched_at = now
+
+    return _credentials
+
+
+# The SigV4 signing key only changes when the UTC date, region, service, or
+# credentials change, so cache it instead of re-deriving four HMAC rounds on
+# every presign. Keyed by access key (not secret) so rotation invalidates it.
+_signing_key_cache: dict = {}
+
+
+def _signing_key(frozen_credentials, datestamp: str, region: str, service: str) -> bytes:
+    """Derive (or fetch the cached) SigV4 signing key."""
+    cache_key = (frozen_credentials.access_key, datestamp, region, service)
+    k_signing = _signing_key_cache.get(cache_key)
+    if k_signing is None:
+        k_date = hmac.new(
+            ("AWS4" + frozen_credentials.secret_key).encode(),
+            datestamp.encode(),
+            hashlib.sha256,
+        ).digest()
+        k_region = hmac.new(k_date, region.encode(), hashlib.sha256).digest()
+        k_service = hmac.new(k_region, service.encode(), hashlib.sha256).digest()
+        k_signing = hmac.new(k_service, b"aws4_request", hashlib.sha256).digest()
+        if len(_signing_key_cache) >= 8:
+            _signing_key_cache.clear()  # stale date rollovers; rebuild is cheap
+        _signing_key_cache[cache_key] = k_signing
+    return k_signing
+
+
+# Presigned URLs stay valid for `expires` seconds, so identical requests
+# (frontend reconnects, tab refocus) can reuse a recent URL instead of
+# re-signing. Entries are dropped once within the safety margin of expiry.
+_URL_CACHE_MAX = 128
+_URL_CACHE_MARGIN = 300.0
+_url_cache: OrderedDict = OrderedDict()
+_url_cache_lock = threading.Lock()
 
 
 def create_presigned_url(base_url: str, region: str, service: str = "bedrock-agentcore", expires: int = 3600) -> str:
@@ -29,9 +97,20 @@ def create_presigned_url(base_url: str, region: str, service: str = "bedrock-age
         ... )
         >>> # Returns: wss://...?X-Amz-Algorithm=AWS4-HMAC-SHA256&X-Amz-Credential=...&X-Amz-Signature=...
     """
-    # Get AWS credentials from session
-    session = boto3.Session(region_name=region)
-    credentials = session.get_credentials()
+    # Reuse a still-valid cached URL for the same signing inputs
+    cache_key = (base_url, region, service, expires)
+    now_mono = time.monotonic()
+    with _url_cache_lock:
+        cached = _url_cache.get(cache_key)
+        if cached is not None:
+            cached_url, cached_expiry = cached
+            if cached_expiry - now_mono > _URL_CACHE_MARGIN:
+                _url_cache.move_to_end(cache_key)
+                return cached_url
+            del _url_cache[cache_key]
+
+    # Get AWS credentials (cached across calls)
+    credentials = _get_credentials(region)
     frozen_credentials = credentials.get_frozen_credentials()
 
     # Parse the URL
@@ -43,70 +122,98 @@ def create_presigned_url(base_url: str, region: str, service: str = "bedrock-age
     # Build the canonical URL for signing
     canonical_url = f"{scheme}://{parsed.netloc}{parsed.path}"
     
-    # Parse existing query parameters
-    query_params = parse_qs(parsed.query) if parsed.query else {}
-    
-    # Flatten query params (parse_qs returns lists)
-    flattened_params = {k: v[0] if isinstance(v, list) else v for k, v in query_params.items()}
-    
-    # Add SigV4 required parameters
-    now = datetime.utcnow()
-    amz_date = now.strftime('%Y%m%dT%H%M%SZ')
-    datestamp = now.strftime('%Y%m%d')
+    # Parse existing query parameters in one pass (parse_qsl avoids the
+    # list-valued dict parse_qs builds, which we'd only flatten again)
+    pairs = parse_qsl(parsed.query, keep_blank_values=True) if parsed.query else []
+
+    # Add SigV4 required parameters. f-string formatting skips the
+    # strftime/locale machinery (and utcnow is deprecated in 3.12).
+    t = time.gmtime()
+    amz_date = (
+        f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}"
+        f"T{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}Z"
+    )
+    datestamp = amz_date[:8]
     credential_scope = f"{datestamp}/{region}/{service}/aws4_request"
-    
-    flattened_params.update({
-        'X-Amz-Algorithm': 'AWS4-HMAC-SHA256',
-        'X-Amz-Credential': f"{frozen_credentials.access_key}/{credential_scope}",
-        'X-Amz-Date': amz_date,
-        'X-Amz-Expires': str(expires),
-    })
-    
+
+    pairs.extend([
+        ('X-Amz-Algorithm', 'AWS4-HMAC-SHA256'),
+        ('X-Amz-Credential', f"{frozen_credentials.access_key}/{credential_scope}"),
+        ('X-Amz-Date', amz_date),
+        ('X-Amz-Expires', str(expires)),
+        ('X-Amz-SignedHeaders', 'host'),
+    ])
+
     # Add session token if present
     if frozen_credentials.token:
-        flattened_params['X-Amz-Security-Token'] = frozen_credentials.token
-    
+        pairs.append(('X-Amz-Security-Token', frozen_credentials.token))
+
     # Create the request for signing
-    canonical_querystring = urlencode(sorted(flattened_params.items()))
-    url_to_sign = f"{canonical_url}?{canonical_querystring}"
-    
-    # Create AWS request and sign it
-    request = AWSRequest(method='GET', url=url_to_sign)
-    SigV4Auth(credentials, service, region).add_auth(request)
-    
-    # Extract the signature from signed request
-    signed_url = request.url
+    canonical_querystring = urlencode(sorted(pairs))
+
+    try:
+        # Fast path: for a GET with only query params and no payload the
+        # canonical request is trivial, so compute the signature directly
+        # instead of allocating a botocore request object per presign.
+        canonical_request = (
+            f"GET\n{parsed.path or '/'}\n{canonical_querystring}\n"
+            f"host:{parsed.netloc}\n\nhost\nUNSIGNED-PAYLOAD"
+        )
+        string_to_sign = (
+            "AWS4-HMAC-SHA256\n"
+            f"{amz_date}\n{credential_scope}\n"
+            f"{hashlib.sha256(canonical_request.encode()).hexdigest()}"
+        )
+        signature = hmac.new(
+            _signing_key(frozen_credentials, datestamp, region, service),
+            string_to_sign.encode(),
+            hashlib.sha256,
+        ).hexdigest()
+        signed_url = (
+            f"{canonical_url}?{canonical_querystring}&X-Amz-Signature={signature}"
+        )
+    except Exception:
+        # Fallback: let botocore build and sign the request
+        request = AWSRequest(method='GET', url=f"{canonical_url}?{canonical_querystring}")
+        SigV4Auth(credentials, service, region).add_auth(request)
+        signed_url = request.url
     
     # Convert back to WebSocket scheme
     if parsed.scheme == "wss":
         signed_url = signed_url.replace("https://", "wss://")
     elif parsed.scheme == "ws":
         signed_url = signed_url.replace("http://", "ws://")
-    
+
+    with _url_cache_lock:
+        _url_cache[cache_key] = (signed_url, now_mono + expires)
+        _url_cache.move_to_end(cache_key)
+        while len(_url_cache) > _URL_CACHE_MAX:
+            _url_cache.popitem(last=False)
+
     return signed_url
 
 
+# Substring scan instead of a full urlparse + parse_qs round trip; the
+# validator only needs to know the parameter names are present.
+_REQUIRED_SIGV4_PARAMS = (
+    'X-Amz-Algorithm=',
+    'X-Amz-Credential=',
+    'X-Amz-Date=',
+    'X-Amz-Signature=',
+)
+
+
 def validate_presigned_url(url: str) -> bool:
     """
     Validate that a URL contains SigV4 authentication parameters.
-    
+
     Args:
         url: The URL to validate
-    
+
     Returns:
         True if URL contains required SigV4 parameters, False otherwise
     """
-    parsed = urlparse(url)
-    query_params = parse_qs(parsed.query)
-    
-    required_params = [
-        'X-Amz-Algorithm',
-        'X-Amz-Credential',
-        'X-Amz-Date',
-        'X-Amz-Signature'
-    ]
-    
-    return all(param in query_params for param in required_params)
+    return all(param in url for param in _REQUIRED_SIGV4_PARAMS)
 
 
 def extract_expiration(url: str) -> datetime:
@@ -130,10 +237,15 @@ def extract_expiration(url: str) -> datetime:
     
     amz_date = query_params['X-Amz-Date'][0]
     expires_seconds = int(query_params['X-Amz-Expires'][0])
-    
-    # Parse the date
-    created_at = datetime.strptime(amz_date, '%Y%m%dT%H%M%SZ')
+
+    # Parse the fixed-width YYYYMMDDTHHMMSSZ date by slicing; strptime is
+    # far slower and the format never varies
+    created_at = datetime(
+        int(amz_date[0:4]), int(amz_date[4:6]), int(amz_date[6:8]),
+        int(amz_date[9:11]), int(amz_date[11:13]), int(amz_date[13:15]),
+        tzinfo=timezone.utc,
+    )
     expires_at = created_at + timedelta(seconds=expires_seconds)
-    
+
     return expires_at
 